@@ -0,0 +1,91 @@
+"""In-memory view of the env file (docker/Dockerfile) holding the pins."""
+import collections
+import contextlib
+import re
+from typing import NamedTuple, Optional
+
+_PIN_RE = re.compile(
+    r"^\s*(?:RUN )?export (?P<tool>[A-Z0-9_]+?)_"
+    r"(?P<kind>DOWNLOAD_URL|VERSION|ROOT|HASH)="
+    r"(?P<value>\S+?)(?: && \\)?$"
+)
+
+
+class EnvInfo(NamedTuple):
+    url: str
+    version: str
+    root: Optional[str]
+    sha256: str
+
+
+class EnvFile:
+    """The env file read once, queried and edited in memory.
+
+    One instance is shared read-only by the parallel scanners in main();
+    mutation stays on the main thread through edit()/set()/save().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = path.read_text().splitlines()
+        self.indices = collections.defaultdict(dict)
+        for index, line in enumerate(self.lines):
+            match = _PIN_RE.match(line)
+            if match is not None:
+                self.indices[match["tool"]][match["kind"]] = index
+
+    @property
+    def text(self):
+        return "\n".join(self.lines) + "\n"
+
+    def _value(self, tool, kind):
+        try:
+            index = self.indices[tool][kind]
+        except KeyError:
+            return None
+        return _PIN_RE.match(self.lines[index])["value"]
+
+    def _replace(self, tool, kind, value):
+        index = self.indices[tool][kind]
+        line = self.lines[index]
+        match = _PIN_RE.match(line)
+        self.lines[index] = (
+            f"{line[:match.start('value')]}{value}{line[match.end('value'):]}"
+        )
+
+    def get(self, tool):
+        """Return the (url, version, root, sha256) pins of ``tool``."""
+        url = self._value(tool, "DOWNLOAD_URL")
+        sha256 = self._value(tool, "HASH")
+        version = self._value(tool, "VERSION")
+        root = None
+        root_value = self._value(tool, "ROOT")
+        if root_value is not None:
+            root, _, version = root_value.rpartition("-")
+        if url is None or version is None or sha256 is None:
+            raise ValueError(f"no {tool} pins found in {self.path}")
+        return EnvInfo(url, version, root, sha256)
+
+    def set(self, tool, result):
+        """Rewrite the pins of ``tool`` from an _others.UpdateResult."""
+        self._replace(tool, "DOWNLOAD_URL", result.url)
+        if "ROOT" in self.indices[tool]:
+            root = self.get(tool).root
+            self._replace(tool, "ROOT", f"{root}-{result.version_new}")
+        else:
+            self._replace(tool, "VERSION", result.version_new)
+        self._replace(tool, "HASH", result.sha256)
+
+    def save(self):
+        self.path.write_text(self.text)
+
+    @contextlib.contextmanager
+    def edit(self):
+        """Write one update to disk, then restore the in-memory state so
+        the next update branches from the original pins again."""
+        saved = list(self.lines)
+        try:
+            yield
+            self.save()
+        finally:
+            self.lines = saved
@@ -0,0 +1,156 @@
+"""Small wrappers around git/gh subprocess calls."""
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import re
+import subprocess
+import tempfile
+import time
+
+import httpx
+
+GITHUB_URL_RE = re.compile(
+    r"^https://github\.com/(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?$"
+)
+
+CACHE_PATH = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+    / "manylinux_update"
+)
+CACHE_TTL = 60 * 60  # seconds; CI reruns within the hour skip ls-remote
+
+_cache_disabled = False
+
+
+def disable_cache():
+    global _cache_disabled
+    _cache_disabled = True
+    _get_tags.cache_clear()
+
+
+@functools.lru_cache(maxsize=128)
+def _get_tags(url, *patterns):
+    """List remote tags matching ``patterns``, one raw ls-remote line per tag.
+
+    Cached twice over: the lru_cache keeps repeated asks within one run
+    to a single ls-remote, and a fresh-enough on-disk copy lets repeated
+    CI runs skip the network round trip entirely (opt out: --no-cache).
+    """
+    key = hashlib.sha256("|".join((url,) + patterns).encode()).hexdigest()
+    cache_file = CACHE_PATH / f"{key}.json"
+    if not _cache_disabled:
+        try:
+            if time.time() - cache_file.stat().st_mtime < CACHE_TTL:
+                return tuple(json.loads(cache_file.read_text()))
+        except (OSError, ValueError):
+            pass
+    cmd = [
+        "git", "-c", "protocol.version=2",
+        "ls-remote", "--refs", "--tags", url, *patterns,
+    ]
+    output = subprocess.run(
+        cmd, check=True, capture_output=True, text=True
+    ).stdout
+    tags = tuple(output.strip().splitlines())
+    if not _cache_disabled:
+        try:
+            CACHE_PATH.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(tags))
+        except OSError:
+            pass
+    return tags
+
+
+@contextlib.contextmanager
+def checkout(url, ref):
+    """Fetch ``ref`` of ``url`` into a temporary repository.
+
+    Runs every git command with an explicit cwd rather than os.chdir so
+    concurrent updates on the thread pool never share mutable state.
+
+    The fetch is shallow and blobless: the only consumer reads commit
+    metadata, so there is no point transferring trees and blobs.
+    """
+    with tempfile.TemporaryDirectory() as path:
+        subprocess.check_call(["git", "init", "-q"], cwd=path)
+        subprocess.check_call(["git", "remote", "add", "origin", url], cwd=path)
+        subprocess.check_call(
+            [
+                "git", "-c", "protocol.version=2", "fetch", "-q",
+                "--filter=blob:none", "--no-tags", "--prune",
+                "--no-recurse-submodules", "--depth=1", "origin", ref,
+            ],
+            cwd=path,
+        )
+        yield path
+
+
+def get_tag_year(url, pattern, tag):
+    """Return the year the commit pointed to by ``tag`` was committed."""
+    match = GITHUB_URL_RE.match(url)
+    if match is not None:
+        # one REST call instead of init/fetch/checkout of a throwaway clone
+        response = httpx.get(
+            f"https://api.github.com/repos/{match['owner']}/{match['repo']}"
+            f"/commits/{tag}"
+        )
+        response.raise_for_status()
+        date = response.json()["commit"]["committer"]["date"]
+        return int(date[:4])
+    for line in _get_tags(url, pattern):
+        sha, _, ref = line.partition("\t")
+        if ref == f"refs/tags/{tag}":
+            break
+    else:
+        raise ValueError(f"tag {tag!r} not found at {url}")
+    with checkout(url, tag) as path:
+        date = subprocess.run(
+            ["git", "show", "-s", "--format=%cI", sha],
+            check=True, capture_output=True, text=True, cwd=path,
+        ).stdout.strip()
+    return int(date[:4])
+
+
+def get_url():
+    """Return the fetch URL of the ``origin`` remote."""
+    return subprocess.run(
+        ["git", "remote", "get-url", "origin"],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def branch(name):
+    subprocess.check_call(["git", "checkout", "-B", name, "master"])
+
+
+def add_and_commit(path, message):
+    subprocess.check_call(["git", "add", str(path)])
+    subprocess.check_call(["git", "commit", "-m", message])
+
+
+def push(name):
+    return subprocess.run(
+        ["git", "push", "-u", "origin", name],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def create_pr(branch_name, title, body=None):
+    if body is None:
+        body = f"Automatic update for {get_url()}"
+    subprocess.check_call(
+        [
+            "gh",
+            "pr",
+            "create",
+            "--head",
+            branch_name,
+            "--title",
+            title,
+            "--body",
+            body,
+        ]
+    )
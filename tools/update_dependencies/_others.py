@@ -0,0 +1,240 @@
+"""Update the non-python tools pinned in the env file (docker/Dockerfile)."""
+import functools
+import hashlib
+import heapq
+import re
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import httpx
+import packaging.version
+
+from . import _git_helpers
+
+# the candidate probes for one tool all hit the same host; with HTTP/2
+# the concurrent tool updates multiplex over one connection per host
+_SESSION = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=16),
+)
+
+GIT_VERSION_RE = re.compile(
+    r"^(?:v|version-|OpenSSL_)?(?P<version>[0-9][0-9_.]*[a-z]?)$"
+)
+
+
+def _minor_bound_patterns(template):
+    """ls-remote refspecs covering only tags that can still be newer.
+
+    Enumerates {major}.{minor} upwards plus a {major + 1} catch-all so
+    the server filters the bulk of the historical tags out before they
+    ever cross the wire.
+    """
+
+    def patterns(version_semver):
+        major, minor = version_semver.release[:2]
+        return tuple(
+            template.format(version=f"{major}.{m}")
+            for m in range(minor, minor + 10)
+        ) + (template.format(version=major + 1),)
+
+    return patterns
+
+
+class _GitTagParameters(NamedTuple):
+    git_url: str
+    tag_pattern: str
+    filename_template: str
+    # tag prefix variants to probe, the one the project is known to use
+    # first; root-style tarball names never take a prefix at all
+    prefixes: tuple = ("",)
+    # version-bounded refspec generator, None keeps the static pattern
+    pattern_fn: Optional[Callable[..., Tuple[str, ...]]] = None
+
+
+_TOOL_PARAMETERS = {
+    "AUTOCONF": _GitTagParameters(
+        "git://git.sv.gnu.org/autoconf",
+        "v2.*",
+        "{root}-{prefix}{version}.tar.gz",
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "AUTOMAKE": _GitTagParameters(
+        "git://git.sv.gnu.org/automake",
+        "v1.*",
+        "{root}-{prefix}{version}.tar.gz",
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "LIBTOOL": _GitTagParameters(
+        "git://git.sv.gnu.org/libtool",
+        "v2.*",
+        "{root}-{prefix}{version}.tar.gz",
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "GIT": _GitTagParameters(
+        "https://github.com/git/git.git",
+        "v2.*",
+        "{root}-{prefix}{version}.tar.gz",
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "CMAKE": _GitTagParameters(
+        "https://github.com/Kitware/CMake.git",
+        "v3.*",
+        "{prefix}{version}/cmake-{version}.tar.gz",
+        prefixes=("v", ""),
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "SWIG": _GitTagParameters(
+        "https://github.com/swig/swig.git",
+        "v4.*",
+        "{root}-{prefix}{version}.tar.gz",
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "PATCHELF": _GitTagParameters(
+        "https://github.com/NixOS/patchelf.git",
+        "0.*",
+        "{prefix}{version}.tar.gz",
+        prefixes=("", "v"),
+        pattern_fn=_minor_bound_patterns("{version}*"),
+    ),
+    "LIBXCRYPT": _GitTagParameters(
+        "https://github.com/besser82/libxcrypt.git",
+        "v4.*",
+        "{prefix}{version}.tar.gz",
+        prefixes=("v", ""),
+        pattern_fn=_minor_bound_patterns("v{version}*"),
+    ),
+    "SQLITE_AUTOCONF": _GitTagParameters(
+        "https://github.com/sqlite/sqlite.git",
+        "version-3.*",
+        "{root}-{prefix}{version}.tar.gz",
+        pattern_fn=_minor_bound_patterns("version-{version}*"),
+    ),
+    # the OpenSSL pattern is already pinned to one release line
+    "OPENSSL": _GitTagParameters(
+        "https://github.com/openssl/openssl.git",
+        "OpenSSL_1_1_1*",
+        "{root}-{prefix}{version}.tar.gz",
+    ),
+}
+
+
+class UpdateResult(NamedTuple):
+    version_new: str
+    version_old: str
+    prefix: str
+    sha256: str
+    url: str
+
+
+def _decode_sqlite_version(version):
+    # SQLITE_AUTOCONF_ROOT encodes version 3.34.0 as 3340000
+    return f"{int(version[0])}.{int(version[1:3])}.{int(version[3:5])}"
+
+
+def _encode_sqlite_version(version):
+    major, minor, patch = (int(part) for part in version.split(".")[:3])
+    return f"{major}{minor:02d}{patch:02d}00"
+
+
+@functools.lru_cache(maxsize=1024)
+def _patch_version(tool, version):
+    """Turn a tool version into something packaging.version can compare."""
+    if tool == "OPENSSL":
+        version = version.replace("_", ".")
+        if version[-1].isalpha():
+            # 1.1.1j sorts after 1.1.1 and before 1.1.1k
+            version = f"{version[:-1]}.{ord(version[-1]) - ord('a') + 1}"
+    elif tool == "SQLITE_AUTOCONF" and "." not in version:
+        version = _decode_sqlite_version(version)
+    return version
+
+
+def _env_version(tool, version):
+    """Turn a dotted version back into the form stored in the env file."""
+    if tool == "SQLITE_AUTOCONF":
+        return _encode_sqlite_version(version)
+    return version
+
+
+# _get_result returns on the first candidate that actually exists upstream,
+# so a handful of the newest tags is all it ever looks at
+_MAX_CANDIDATES = 5
+
+
+def _filter_git_tags(tool, version):
+    """List versions newer than ``version``, newest first, with their tags."""
+    params = _TOOL_PARAMETERS[tool]
+    version_semver = packaging.version.parse(_patch_version(tool, version))
+    if params.pattern_fn is not None:
+        patterns = params.pattern_fn(version_semver)
+    else:
+        patterns = (params.tag_pattern,)
+    parsed = (
+        (packaging.version.parse(_patch_version(tool, candidate)), candidate, tag)
+        for candidate, tag in (
+            (match["version"].replace("_", "."), match.string)
+            for match in map(
+                GIT_VERSION_RE.match,
+                (
+                    line.split("refs/tags/", 1)[1]
+                    for line in _git_helpers._get_tags(params.git_url, *patterns)
+                ),
+            )
+            if match is not None
+        )
+    )
+    newest = heapq.nlargest(
+        _MAX_CANDIDATES,
+        (
+            entry
+            for entry in parsed
+            if entry[0] > version_semver and not entry[0].is_prerelease
+        ),
+    )
+    return [(candidate, tag) for _, candidate, tag in newest]
+
+
+def _patch_url(tool, url, tag):
+    if tool == "SQLITE_AUTOCONF":
+        # sqlite.org serves tarballs from a per-year directory
+        params = _TOOL_PARAMETERS[tool]
+        year = _git_helpers.get_tag_year(params.git_url, params.tag_pattern, tag)
+        url = re.sub(r"/[0-9]{4}$", f"/{year}", url)
+    return url
+
+
+def _get_result(tool, info, candidates):
+    params = _TOOL_PARAMETERS[tool]
+    for candidate, tag in candidates:
+        url = _patch_url(tool, info.url, tag)
+        version_new = _env_version(tool, candidate)
+        for prefix in params.prefixes:
+            filename = params.filename_template.format(
+                prefix=prefix, version=version_new, root=info.root
+            )
+            full_url = f"{url}/{filename}".replace(
+                f"${{{tool}_ROOT}}", f"{info.root}-{version_new}"
+            )
+            # cheap probe first, only download the tarball that exists
+            response = _SESSION.head(full_url)
+            if response.status_code != 200:
+                continue
+            digest = hashlib.sha256()
+            with _SESSION.stream("GET", full_url) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(65536):
+                    digest.update(chunk)
+            return UpdateResult(
+                version_new, info.version, prefix, digest.hexdigest(), url
+            )
+    return None
+
+
+def get_update_map(tool, env):
+    """Return the UpdateResult for ``tool``, or None when already up to date."""
+    info = env.get(tool)
+    candidates = _filter_git_tags(tool, info.version)
+    if not candidates:
+        return None
+    return _get_result(tool, info, candidates)
@@ -0,0 +1,118 @@
+"""Update the CPython interpreters built into the image."""
+import collections
+import re
+from typing import NamedTuple
+
+import httpx
+import packaging.version
+
+# every lookup below goes to www.python.org; HTTP/2 keeps them all on
+# one multiplexed connection
+_SESSION = httpx.Client(http2=True, limits=httpx.Limits(max_connections=16))
+
+PYTHON_VERSION_RE = re.compile(
+    r"^RUN manylinux-entrypoint /build_scripts/build-cpython\.sh "
+    r"(?P<version>3\.[0-9]+\.[0-9]+)$",
+    re.MULTILINE,
+)
+RELEASE_API_URL = "https://www.python.org/api/v2/downloads/release/?is_published=true"
+RELEASE_FILE_API_URL = "https://www.python.org/api/v2/downloads/release_file/"
+OS_SOURCE = 3  # "Source release" in the python.org downloads API
+NAME_RE = re.compile(r"^Python (?P<version>3\.[0-9]+\.[0-9]+)$")
+URI_RE = re.compile(r"/release/(?P<release>[0-9]+)/$")
+
+
+def _get_paginated(url):
+    """Yield every entry of a python.org downloads API listing."""
+    while url:
+        response = _SESSION.get(url)
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, list):
+            yield from data
+            return
+        yield from data["results"]
+        url = data.get("next")
+
+
+class UpdateResult(NamedTuple):
+    version_old: str
+    version_new: str
+
+
+class _Candidate(NamedTuple):
+    version: packaging.version.Version
+    release: int
+
+
+def _parse_env_file(env):
+    return [match["version"] for match in PYTHON_VERSION_RE.finditer(env.text)]
+
+
+def _get_candidates(version_semver, releases):
+    """List the published releases newer than ``version_semver``, same minor."""
+    candidates = []
+    for entry in releases:
+        match = NAME_RE.match(entry["name"])
+        if match is None:
+            continue
+        candidate_semver = packaging.version.parse(match["version"])
+        if candidate_semver.release[:2] != version_semver.release[:2]:
+            continue
+        if candidate_semver <= version_semver or entry["pre_release"]:
+            continue
+        release = int(URI_RE.search(entry["resource_uri"])["release"])
+        candidates.append(_Candidate(candidate_semver, release))
+    candidates.sort(reverse=True)
+    return candidates
+
+
+def _get_release_files():
+    """Map release id to its published source files, one listing for all."""
+    files_by_release = collections.defaultdict(list)
+    for file in _get_paginated(
+        f"{RELEASE_FILE_API_URL}?os={OS_SOURCE}&limit=1000"
+    ):
+        release = int(URI_RE.search(file["release"])["release"])
+        files_by_release[release].append(file)
+    return files_by_release
+
+
+def _get_update(candidate, files_by_release):
+    """Check that a source tarball was actually published for ``candidate``."""
+    return any(
+        file["url"].endswith(".tgz")
+        for file in files_by_release.get(candidate.release, ())
+    )
+
+
+def _get_release(version, releases, files_by_release):
+    """Return the newest release in ``version``'s minor with a source tarball."""
+    version_semver = packaging.version.parse(version)
+    for candidate in _get_candidates(version_semver, releases):
+        if _get_update(candidate, files_by_release):
+            return UpdateResult(version, str(candidate.version))
+    return None
+
+
+def get_updates(env):
+    """Return one UpdateResult per interpreter that has a newer release."""
+    releases = list(_get_paginated(RELEASE_API_URL))
+    # one listing up front instead of one release_file round trip per
+    # candidate of every minor version
+    files_by_release = _get_release_files()
+    updates = []
+    for version in _parse_env_file(env):
+        result = _get_release(version, releases, files_by_release)
+        if result is not None:
+            updates.append(result)
+    return updates
+
+
+def update(env, result):
+    for index, line in enumerate(env.lines):
+        match = PYTHON_VERSION_RE.match(line)
+        if match is not None and match["version"] == result.version_old:
+            env.lines[index] = line.replace(
+                result.version_old, result.version_new
+            )
@@ -0,0 +1,122 @@
+"""Check the tools pinned in docker/Dockerfile for new upstream releases.
+
+Opens one pull request per available update. Requires push access to the
+repository and the ``gh`` command line tool for the pull requests.
+"""
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import _env_file, _git_helpers, _others, _python
+
+ENV_PATH = Path(__file__).resolve().parent.parent.parent / "docker" / "Dockerfile"
+TOOLS = {
+    "AUTOCONF",
+    "AUTOMAKE",
+    "CMAKE",
+    "GIT",
+    "LIBTOOL",
+    "LIBXCRYPT",
+    "OPENSSL",
+    "PATCHELF",
+    "SQLITE_AUTOCONF",
+    "SWIG",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="update_dependencies")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only print the available updates, do not open pull requests",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the on-disk ls-remote cache and ask every remote again",
+    )
+    parser.add_argument(
+        "--per-tool-pr",
+        action="store_true",
+        help="open one pull request per updated tool instead of one for all",
+    )
+    args = parser.parse_args()
+    if args.no_cache:
+        _git_helpers.disable_cache()
+
+    # the env file is read exactly once; the scanners below share this
+    # instance read-only
+    env = _env_file.EnvFile(ENV_PATH)
+
+    # Gathering the update metadata is dominated by network latency (one
+    # git ls-remote plus one or more HTTP round trips per tool), so fan it
+    # out on a thread pool. Only the env file mutation and the git
+    # branch/commit/push dance below must stay sequential.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            tool: executor.submit(_others.get_update_map, tool, env)
+            for tool in TOOLS
+        }
+        python_future = executor.submit(_python.get_updates, env)
+        results = {tool: future.result() for tool, future in futures.items()}
+        python_results = python_future.result()
+
+    updates = []
+    for tool in sorted(TOOLS):
+        result = results[tool]
+        if result is None:
+            continue
+        updates.append(
+            (
+                tool.lower(),
+                result.version_new,
+                f"Bump {tool.lower()} {result.version_old} → {result.version_new}",
+                functools.partial(env.set, tool, result),
+            )
+        )
+    for result in python_results:
+        updates.append(
+            (
+                "python",
+                result.version_new,
+                f"Bump python {result.version_old} → {result.version_new}",
+                functools.partial(_python.update, env, result),
+            )
+        )
+
+    if args.dry_run:
+        for _, _, message, _ in updates:
+            print(message)
+        return
+    if not updates:
+        return
+
+    if args.per_tool_pr:
+        for name, version, message, apply in updates:
+            branch_name = f"update-{name}-{version}"
+            _git_helpers.branch(branch_name)
+            with env.edit():
+                apply()
+            _git_helpers.add_and_commit(ENV_PATH, message)
+            _git_helpers.push(branch_name)
+            _git_helpers.create_pr(branch_name, message)
+        return
+
+    # all updates touch the same file, ship them as one branch, one
+    # commit and one pull request
+    branch_name = "update-dependencies"
+    title = "Update dependencies"
+    body = "\n".join(message for _, _, message, _ in updates)
+    _git_helpers.branch(branch_name)
+    with env.edit():
+        for _, _, _, apply in updates:
+            apply()
+    _git_helpers.add_and_commit(ENV_PATH, f"{title}\n\n{body}")
+    _git_helpers.push(branch_name)
+    _git_helpers.create_pr(branch_name, title, body)
+
+
+if __name__ == "__main__":
+    main()